@@ -47,6 +47,7 @@ import arfile
 import tarfile
 import textwrap
 import collections
+import functools
 
 
 def order(x):
@@ -62,11 +63,17 @@ def order(x):
     return 256 + ord(x)
 
 
+# Splits a version into its upstream part and optional "-r" revision suffix
+_VERSION_REVISION = re.compile(r"(.+?)(-r.+)?$")
+
 class Version(object):
     """A class for holding parsed package version information."""
+    __slots__ = ('epoch', 'version', '_str')
+
     def __init__(self, epoch, version):
         self.epoch = epoch
         self.version = version
+        self._str = None
 
     def _versioncompare(self, selfversion, refversion):
         """
@@ -123,8 +130,8 @@ class Version(object):
         elif (self.epoch < ref.epoch):
             return -1
         else:
-            self_ver_comps = re.match(r"(.+?)(-r.+)?$", self.version)
-            ref_ver_comps = re.match(r"(.+?)(-r.+)?$", ref.version)
+            self_ver_comps = _VERSION_REVISION.match(self.version)
+            ref_ver_comps = _VERSION_REVISION.match(ref.version)
             #print((self_ver_comps.group(1), self_ver_comps.group(2)))
             #print((ref_ver_comps.group(1), ref_ver_comps.group(2)))
             r = self._versioncompare(self_ver_comps.group(1), ref_ver_comps.group(1))
@@ -134,15 +141,21 @@ class Version(object):
             return r
 
     def __str__(self):
-        return str(self.epoch) + ":" + self.version
-
+        # versions are never modified, build the string only once
+        if self._str is None:
+            self._str = str(self.epoch) + ":" + self.version
+        return self._str
+
+# Versions are never modified once parsed, so the same instance can be
+# shared by every package with the same version string
+@functools.lru_cache(maxsize=4096)
 def parse_version(versionstr):
     epoch = 0
-    # check for epoch
-    m = re.match('([0-9]*):(.*)', versionstr)
-    if m:
-        (epochstr, versionstr) = m.groups()
-        epoch = int(epochstr)
+    # check for epoch, made of the digits before the first colon
+    colon = versionstr.find(':')
+    if colon != -1 and not versionstr[:colon].strip('0123456789'):
+        epoch = int(versionstr[:colon])
+        versionstr = versionstr[colon + 1:]
     return Version(epoch, versionstr)
 
 class Package(object):
@@ -153,7 +166,7 @@ class Package(object):
     # relpath: If this argument is set, the file path is given relative to this
     #   path when a string representation of the Package object is created. If
     #   this argument is not set, the basename of the file path is given.
-    def __init__(self, fn=None, relpath=None, all_fields=None):
+    def __init__(self, fn=None, relpath=None, all_fields=None, size=None):
         self.package = None
         self.version = 'none'
         self.parsed_version = None
@@ -173,6 +186,9 @@ class Package(object):
         # md5 and size is lazy attribute, computed on demand
         #self.md5 = None
         #self.size = None
+        # the size can be given by callers which already stat-ed the file
+        if size is not None:
+            self.size = size
         self.installed_size = None
         self.filename = None
         self.file_ext_opk = "ipk"
@@ -232,28 +248,32 @@ class Package(object):
         if not self.fn:
             self.md5 = 'Unknown'
         else:
-            f = open(self.fn, "rb")
-            sum = hashlib.md5()
-            while True:
-               data = f.read(1024)
-               if not data: break
-               sum.update(data)
-            f.close()
-            self.md5 = sum.hexdigest()
+            self.md5 = self._computeFileDigest("md5")
 
     def _computeFileSHA256(self):
         # compute the SHA256.
         if not self.fn:
             self.sha256 = 'Unknown'
         else:
-            f = open(self.fn, "rb")
-            sum = hashlib.sha256()
+            self.sha256 = self._computeFileDigest("sha256")
+
+    def _computeFileDigest(self, name):
+        with open(self.fn, "rb") as f:
+            # let hashlib run the whole read and update loop in C when
+            # available (Python 3.11 and later)
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, name).hexdigest()
+
+            # otherwise feed the file through a single reusable buffer, to
+            # avoid allocating a new bytes object for each chunk
+            sum = hashlib.new(name)
+            buf = bytearray(1 << 20)
+            view = memoryview(buf)
             while True:
-               data = f.read(1024)
-               if not data: break
-               sum.update(data)
-            f.close()
-            self.sha256 = sum.hexdigest()
+               n = f.readinto(buf)
+               if not n: break
+               sum.update(view[:n])
+            return sum.hexdigest()
 
     def _get_file_size(self):
         if not self.fn: